@@ -0,0 +1,295 @@
+import threading
+import time
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:  # optional: pip install brotli
+    import brotli
+except ImportError:  # pragma: no cover - depends on installed extras
+    brotli = None
+
+try:  # optional: pip install zstandard
+    import zstandard
+except ImportError:  # pragma: no cover - depends on installed extras
+    zstandard = None
+
+
+class _GzipCompressor:
+    min_level, max_level = 1, 9
+
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    min_level, max_level = 0, 11
+
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdCompressor:
+    min_level, max_level = 1, 22
+
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+# server preference order; encodings whose library is missing are skipped
+COMPRESSORS = {"gzip": _GzipCompressor}
+if zstandard is not None:
+    COMPRESSORS = {"zstd": _ZstdCompressor, **COMPRESSORS}
+if brotli is not None:
+    COMPRESSORS = {"br": _BrotliCompressor, **COMPRESSORS}
+
+
+# streamed input is flushed to the client once this much has built up;
+# every flush ends a compressed block, so flushing each small chunk wastes
+# most of the ratio
+STREAM_FLUSH_SIZE = 16 * 1024  # bytes
+
+# media types that are already compressed or must not be buffered
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream",
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zstd",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+)
+
+
+def is_excluded_content_type(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    # image/svg+xml is text and compresses well
+    if media_type == "image/svg+xml":
+        return False
+    return media_type.startswith(EXCLUDED_CONTENT_TYPES)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick the best supported encoding from an Accept-Encoding header."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in COMPRESSORS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionStats:
+    """Thread-safe counters for bytes saved vs CPU time spent compressing."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._by_encoding = {}
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float):
+        with self._lock:
+            entry = self._by_encoding.setdefault(
+                encoding,
+                {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0},
+            )
+            entry["responses"] += 1
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+            entry["cpu_seconds"] += cpu_seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {}
+            for encoding, entry in self._by_encoding.items():
+                saved = entry["bytes_in"] - entry["bytes_out"]
+                cpu_ms = entry["cpu_seconds"] * 1000
+                result[encoding] = {
+                    **entry,
+                    "bytes_saved": saved,
+                    "bytes_saved_per_cpu_ms": saved / cpu_ms if cpu_ms else None,
+                }
+            return result
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses responses with gzip, br or zstd.
+
+    Only bodies of at least `minimum_size` bytes are compressed, and media
+    types in EXCLUDED_CONTENT_TYPES pass through untouched. Streaming
+    responses are compressed as they pass through, never buffered whole;
+    output is flushed every STREAM_FLUSH_SIZE bytes of input. `route_levels`
+    maps path prefixes to a compression level (longest prefix wins, 0
+    disables compression); the level is clamped to each encoder's own range.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 500,
+        default_level: int = 6,
+        route_levels: dict[str, int] | None = None,
+        stats: CompressionStats = compression_stats,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.default_level = default_level
+        self.route_levels = sorted(
+            (route_levels or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.stats = stats
+
+    def level_for(self, path: str) -> int:
+        for prefix, level in self.route_levels:
+            if path.startswith(prefix):
+                return level
+        return self.default_level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        level = self.level_for(scope["path"])
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if level <= 0 or encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            self.app, send, encoding, level, self.minimum_size, self.stats
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, app, send, encoding, level, minimum_size, stats):
+        self.app = app
+        self.downstream = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.stats = stats
+        self.start_message = None
+        self.compressor = None
+        self.passthrough = False
+        self.bytes_in = self.bytes_out = 0
+        self.unflushed = 0
+        self.cpu_seconds = 0.0
+
+    def _begin(self, headers: MutableHeaders):
+        cls = COMPRESSORS[self.encoding]
+        self.compressor = cls(max(cls.min_level, min(cls.max_level, self.level)))
+        del headers["content-length"]
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("accept-encoding")
+
+    def _compress(self, data: bytes, finish: bool) -> bytes:
+        started = time.thread_time()
+        out = self.compressor.compress(data) if data else b""
+        self.unflushed += len(data)
+        if finish:
+            out += self.compressor.finish()
+        elif self.unflushed >= STREAM_FLUSH_SIZE:
+            out += self.compressor.flush()
+            self.unflushed = 0
+        self.cpu_seconds += time.thread_time() - started
+        self.bytes_in += len(data)
+        self.bytes_out += len(out)
+        if finish:
+            self.stats.record(
+                self.encoding, self.bytes_in, self.bytes_out, self.cpu_seconds
+            )
+        return out
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            # hold the headers until the first body chunk tells us the size
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(scope=start)
+            declared = headers.get("content-length")
+            if declared is not None and declared.isdigit():
+                size = int(declared)
+            elif not more_body:
+                size = len(body)
+            else:
+                size = None  # unknown-length stream: always compress
+            if (
+                "content-encoding" in headers
+                or is_excluded_content_type(headers.get("content-type", ""))
+                or (size is not None and size < self.minimum_size)
+            ):
+                self.passthrough = True
+                await self.downstream(start)
+                await self.downstream(message)
+                return
+            self._begin(headers)
+            await self.downstream(start)
+
+        out = self._compress(body, finish=not more_body)
+        if out or not more_body:
+            await self.downstream(
+                {"type": "http.response.body", "body": out, "more_body": more_body}
+            )
@@ -1,6 +1,8 @@
-from fastapi import Query, HTTPException
+from fastapi import Query, HTTPException, Request, Response
 from typing import Literal, Optional
 
+from . import models
+
 
 # soritng dependency
 def sorting_params(
@@ -45,3 +47,53 @@ def filtering_params(
         filters["title"] = title
 
     return filters
+
+
+# sparse fieldset dependency
+def fields_params(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated task fields to return, e.g. id,title"
+    ),
+):
+    """
+    Reusable dependency for selecting a subset of Task fields.
+    Returns a tuple of validated column names, or None for the full task.
+    """
+    if fields is None:
+        return None
+    valid_fields = models.Task.__table__.columns.keys()
+    requested = []
+    for field in fields.split(","):
+        field = field.strip().lower()
+        if not field:
+            continue
+        if field not in valid_fields:
+            raise HTTPException(status_code=400, detail=f"Invalid field: {field}")
+        if field not in requested:
+            requested.append(field)
+    if not requested:
+        raise HTTPException(status_code=400, detail="No fields requested")
+    return tuple(requested)
+
+
+# rate limiting dependency
+def rate_limit(times: int, seconds: int):
+    """
+    Reusable dependency wrapping fastapi_limiter's RateLimiter.
+    The limiter is built on first use, and requests pass unthrottled while
+    the optional Redis backend is not connected.
+    """
+    limiter = None
+
+    async def dependency(request: Request, response: Response):
+        nonlocal limiter
+        startup = getattr(request.app.state, "startup", None)
+        if startup is None or startup.rate_limiter != "ok":
+            return
+        if limiter is None:
+            from fastapi_limiter.depends import RateLimiter
+
+            limiter = RateLimiter(times=times, seconds=seconds)
+        await limiter(request, response)
+
+    return dependency
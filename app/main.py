@@ -1,55 +1,92 @@
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Response
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
-import redis.asyncio as redis
+import asyncio
 import logging
 
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from sqlalchemy import select, or_, func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from . import models, schemas
-from .dependencies import pagination_params, sorting_params, filtering_params
-from .database import engine, get_db, Base
+from .dependencies import (
+    pagination_params,
+    sorting_params,
+    filtering_params,
+    fields_params,
+    rate_limit,
+)
+from .database import engine, get_db
 from .security import hash_password, verify_password
-from jose import jwt, JWTError
 from .utils import send_password_reset_email
+from .stats import apply_task_delta, get_task_stats, rebuild_task_stats
+from .compression import CompressionMiddleware, compression_stats
+from .revocation import revocation_store, TokenAlreadyRevoked
+from .startup import StartupState, ensure_schema, warm_up, init_rate_limiter
 from .auth import (
     create_access_token,
     create_refresh_token,
     create_password_reset_token,
+    decode_token,
     get_current_user,
     get_current_admin,
-    SECRET_KEY,
-    ALGORITHM,
+    InvalidTokenError,
 )
 
 logger = logging.getLogger(__name__)
 
+# response compression config
+COMPRESSION_MINIMUM_SIZE = 500  # bytes
+COMPRESSION_DEFAULT_LEVEL = 6
+COMPRESSION_ROUTE_LEVELS = {
+    "/tasks": 5,  # hot, latency sensitive pages
+    "/admin": 9,  # bulky, rarely requested listings
+}
+
 
 # Define the lifespan async context manager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
-    try:
-        redis_connection = redis.from_url(
-            "redis://localhost", encoding="utf-8", decode_responses=True
-        )
-        await FastAPILimiter.init(redis_connection)
-        logger.info("✅ Redis rate limiter initialized successfully.")
-    except Exception as e:
-        logger.warning(f"⚠️ Skipping Redis initialization: {e}")
-        redis_connection = None
+    state = app.state.startup = StartupState()
+    ensure_schema(engine)
+    state.schema = "ok"
+    state.mark("schema")
+    # warm-up and Redis run in the background; /readyz reports when done
+    background = [
+        asyncio.create_task(warm_up(state, engine)),
+        asyncio.create_task(init_rate_limiter(state)),
+    ]
     yield
-    if redis_connection:
-        await redis_connection.aclose()
-    # Shutdown logic (optional)
-    # Add any cleanup code here
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    if state.redis:
+        await state.redis.aclose()
 
 
 app = FastAPI(lifespan=lifespan, title="Task Manager with DB")
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MINIMUM_SIZE,
+    default_level=COMPRESSION_DEFAULT_LEVEL,
+    route_levels=COMPRESSION_ROUTE_LEVELS,
+)
+
+
+# liveness: the process is up and serving
+@app.get("/healthz")
+def healthz():
+    return {"status": "ok"}
+
+
+# readiness: schema checked and warm-up finished
+@app.get("/readyz")
+def readyz(response: Response):
+    state = app.state.startup
+    if not state.ready:
+        response.status_code = 503
+    return state.report()
 
 
 @app.post("/users", response_model=schemas.UserOut, status_code=201)
@@ -66,7 +103,7 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
 
 
 # login route
-@app.post("/login", dependencies=[Depends(RateLimiter(times=5, seconds=60))])
+@app.post("/login", dependencies=[Depends(rate_limit(times=5, seconds=60))])
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
@@ -100,24 +137,41 @@ def login(
     }
 
 
+def _decode_refresh_token(refresh_token: str) -> dict:
+    try:
+        payload = decode_token(refresh_token)
+    except InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    if payload.get("type") != "refresh" or "jti" not in payload:
+        raise HTTPException(status_code=401, detail="Invalid token type")
+    return payload
+
+
+# rotate: the presented refresh token is revoked and a new pair is issued
 @app.post("/refresh")
 def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
+    payload = _decode_refresh_token(refresh_token)
+    if revocation_store.is_revoked(db, payload["jti"], payload["exp"]):
+        raise HTTPException(status_code=401, detail="Refresh token revoked")
     try:
-        payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
-        if payload.get("type") != "refresh":
-            raise HTTPException(status_code=401, detail="Invalid token type")
-        user_id: int = payload.get("sub")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid refresh token")
-    user = (
-        db.execute(select(models.User).where(models.User.id == user_id))
-        .scalars()
-        .first()
-    )
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    new_access_token = create_access_token(data={"sub": str(user.id)})
-    return {"access_token": new_access_token, "token_type": "bearer"}
+        revocation_store.revoke(db, payload["jti"], payload["exp"])
+    except TokenAlreadyRevoked:
+        raise HTTPException(status_code=401, detail="Refresh token revoked")
+    user_id = payload.get("sub")
+    return {
+        "access_token": create_access_token(data={"sub": user_id}),
+        "refresh_token": create_refresh_token(data={"sub": user_id}),
+        "token_type": "bearer",
+    }
+
+
+# idempotent: any validly signed refresh token gets 204, revoked or not
+@app.post("/logout", status_code=204)
+def logout(refresh_token: str, db: Session = Depends(get_db)):
+    payload = _decode_refresh_token(refresh_token)
+    with suppress(TokenAlreadyRevoked):
+        revocation_store.revoke(db, payload["jti"], payload["exp"])
+    return None
 
 
 @app.get("/admin/users", response_model=List[schemas.UserOut])
@@ -128,6 +182,20 @@ def list_users(
     return db.execute(select(models.User)).unique().scalars().all()
 
 
+@app.get("/admin/metrics/compression")
+def compression_metrics(current_admin: models.User = Depends(get_current_admin)):
+    return compression_stats.snapshot()
+
+
+@app.post("/admin/tasks/stats/rebuild")
+def rebuild_stats(
+    current_admin: models.User = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    buckets = rebuild_task_stats(db)
+    return {"message": "Task stats rebuilt", "buckets": buckets}
+
+
 @app.post("/tasks", response_model=schemas.Task, status_code=201)
 def create_task(
     task: schemas.TaskCreate,
@@ -136,23 +204,39 @@ def create_task(
 ):
     db_task = models.Task(**task.model_dump(), owner_id=current_user.id)
     db.add(db_task)
+    apply_task_delta(db, current_user.id, db_task.completed, db_task.priority, 1)
     db.commit()
     db.refresh(db_task)  # get auto-generated ID
     return db_task
 
 
-@app.get("/tasks", response_model=schemas.PaginatedResponse[schemas.Task])
+@app.get(
+    "/tasks",
+    response_model=schemas.PaginatedResponse[schemas.Task],
+    responses={
+        200: {
+            "description": "A page of tasks. When `fields` is given, each item "
+            "in `data` contains only the requested keys instead of the full "
+            "Task schema."
+        }
+    },
+)
 def list_tasks(
     filters: dict = Depends(filtering_params),
     sorting: dict = Depends(sorting_params),
     pagination: dict = Depends(pagination_params),
+    fields: Optional[tuple] = Depends(fields_params),
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     skip, limit = pagination["skip"], pagination["limit"]
 
-    # Base query (only user’s tasks)
-    query = select(models.Task).where(models.Task.owner_id == current_user.id)
+    # Base query (only user’s tasks), projected down to the requested columns
+    if fields:
+        query = select(*(getattr(models.Task, field) for field in fields))
+    else:
+        query = select(models.Task)
+    query = query.where(models.Task.owner_id == current_user.id)
 
     # ✅ Apply filters
     if "completed" in filters:
@@ -173,7 +257,20 @@ def list_tasks(
         query = query.order_by(sort_column.asc())
 
     # ✅ Apply pagination
-    tasks = db.execute(query.offset(skip).limit(limit)).scalars().all()
+    query = query.offset(skip).limit(limit)
+
+    if fields:
+        # sparse fieldset: plain rows into a trimmed model, skipping the ORM
+        projection = schemas.task_projection(fields)
+        page = schemas.PaginatedResponse[projection](
+            total=total,
+            skip=skip,
+            limit=limit,
+            data=[projection(**row) for row in db.execute(query).mappings()],
+        )
+        return Response(content=page.model_dump_json(), media_type="application/json")
+
+    tasks = db.execute(query).scalars().all()
 
     return schemas.PaginatedResponse(
         total=total,
@@ -183,6 +280,14 @@ def list_tasks(
     )
 
 
+@app.get("/tasks/stats", response_model=schemas.TaskStats)
+def task_stats(
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    return get_task_stats(db, current_user.id)
+
+
 @app.get("/tasks/{task_id}", response_model=schemas.Task)
 def get_task(
     task_id: int,
@@ -221,8 +326,13 @@ def update_task(
     )
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    old_bucket = (bool(task.completed), task.priority)
     for key, value in updated.model_dump().items():
         setattr(task, key, value)
+    new_bucket = (bool(task.completed), task.priority)
+    if new_bucket != old_bucket:
+        apply_task_delta(db, current_user.id, *old_bucket, -1)
+        apply_task_delta(db, current_user.id, *new_bucket, 1)
     db.commit()
     db.refresh(task)
     return task
@@ -246,13 +356,14 @@ def delete_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
+    apply_task_delta(db, current_user.id, task.completed, task.priority, -1)
     db.delete(task)
     db.commit()
     return None
 
 
 @app.post(
-    "/password-reset/request", dependencies=[Depends(RateLimiter(times=3, seconds=600))]
+    "/password-reset/request", dependencies=[Depends(rate_limit(times=3, seconds=600))]
 )
 def request_password_reset(email: str, db: Session = Depends(get_db)):
     user = (
@@ -271,11 +382,11 @@ def request_password_reset(email: str, db: Session = Depends(get_db)):
 @app.post("/password-reset/confirm")
 def reset_password(token: str, new_password: str, db: Session = Depends(get_db)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(status_code=400, detail="Invalid token")
-    except JWTError:
+    except InvalidTokenError:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
 
     user = (
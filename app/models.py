@@ -1,7 +1,11 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from .database import Base
 
+# bump whenever the tables below change; anything beyond adding a new table
+# also needs an upgrade step in startup.UPGRADES
+SCHEMA_VERSION = 2
+
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -27,3 +31,43 @@ class User(Base):
     tasks = relationship(
         "Task", back_populates="owner", cascade="all, delete", lazy="joined"
     )
+
+
+class TaskCount(Base):
+    """Running task counts per (owner, completed, priority) bucket."""
+
+    __tablename__ = "task_counts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    completed = Column(Boolean, nullable=False)
+    priority = Column(Integer, nullable=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    # one row per bucket; NULL priorities are mapped to a sentinel because
+    # unique indexes treat NULLs as distinct
+    __table_args__ = (
+        Index(
+            "ux_task_counts_bucket",
+            owner_id,
+            completed,
+            func.coalesce(priority, -(2**31)),
+            unique=True,
+        ),
+    )
+
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+
+
+class RevokedToken(Base):
+    """Refresh token ids that may no longer be used, kept until they expire."""
+
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String, unique=True, nullable=False)
+    expires_at = Column(Integer, index=True, nullable=False)  # unix seconds
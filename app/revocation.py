@@ -0,0 +1,119 @@
+import threading
+import time
+
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models
+
+# revoked ids are grouped by the hour their token expires in
+BUCKET_SECONDS = 3600
+# how often a worker pulls revocations made by other workers
+SYNC_INTERVAL = 5  # seconds
+# how often expired rows are deleted from the table
+PURGE_INTERVAL = 600  # seconds
+
+
+class TokenAlreadyRevoked(Exception):
+    """Raised when revoking a token id that another request already revoked."""
+
+
+class RevocationStore:
+    """
+    In-process set of revoked refresh-token ids, backed by the
+    revoked_tokens table.
+
+    Ids are kept as 16-byte keys in per-hour expiry buckets, so a lookup is
+    one set membership test and expired buckets are dropped wholesale. The
+    table is the source of truth: each worker pulls new rows at most every
+    SYNC_INTERVAL seconds, and expired rows are deleted every PURGE_INTERVAL.
+    """
+
+    def __init__(self, sync_interval: float = SYNC_INTERVAL):
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._buckets: dict[int, set[bytes]] = {}
+            self._cursor = 0  # highest revoked_tokens.id already loaded
+            self._next_sync = 0.0
+            self._next_purge = 0.0
+
+    @staticmethod
+    def _key(jti: str) -> bytes:
+        try:
+            return bytes.fromhex(jti)
+        except ValueError:
+            return jti.encode()
+
+    def _add(self, jti: str, expires_at: int):
+        self._buckets.setdefault(expires_at // BUCKET_SECONDS, set()).add(
+            self._key(jti)
+        )
+
+    def _collect_garbage(self, now: float):
+        current = int(now) // BUCKET_SECONDS
+        for bucket in [b for b in self._buckets if b < current]:
+            del self._buckets[bucket]
+
+    def sync(self, db: Session, force: bool = False):
+        """Load revocations from the DB and purge expired entries."""
+        now = time.time()
+        with self._lock:
+            if not force and now < self._next_sync:
+                return
+            self._next_sync = now + self.sync_interval
+            cursor = self._cursor
+            purge = now >= self._next_purge
+            if purge:
+                self._next_purge = now + PURGE_INTERVAL
+
+        rows = db.execute(
+            select(
+                models.RevokedToken.id,
+                models.RevokedToken.jti,
+                models.RevokedToken.expires_at,
+            ).where(
+                models.RevokedToken.id > cursor,
+                models.RevokedToken.expires_at > int(now),
+            )
+        ).all()
+        if purge:
+            db.execute(
+                delete(models.RevokedToken).where(
+                    models.RevokedToken.expires_at <= int(now)
+                )
+            )
+            db.commit()
+
+        with self._lock:
+            for row_id, jti, expires_at in rows:
+                self._add(jti, expires_at)
+                self._cursor = max(self._cursor, row_id)
+            self._collect_garbage(now)
+
+    def is_revoked(self, db: Session, jti: str, expires_at: int) -> bool:
+        self.sync(db)
+        with self._lock:
+            bucket = self._buckets.get(expires_at // BUCKET_SECONDS)
+            return bucket is not None and self._key(jti) in bucket
+
+    def revoke(self, db: Session, jti: str, expires_at: int):
+        """
+        Persist and cache a revocation. The unique jti column makes this
+        the authoritative check when two requests race on the same token.
+        """
+        db.add(models.RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise TokenAlreadyRevoked(jti)
+        with self._lock:
+            self._add(jti, expires_at)
+
+
+revocation_store = RevocationStore()
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import Optional, List, Generic, TypeVar
+from functools import lru_cache
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, create_model
+from typing import Optional, List, Generic, TypeVar, Tuple, Type
 
 
 # for creating a task, (request)
@@ -17,6 +18,16 @@ class Task(TaskCreate):
     model_config = ConfigDict(from_attributes=True)
 
 
+# returning only the requested task fields (cached per field set)
+@lru_cache(maxsize=64)
+def task_projection(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    return create_model(
+        "TaskFields_" + "_".join(fields),
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (Task.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
 # user base
 class UserBase(BaseModel):
     username: str
@@ -52,3 +63,18 @@ class PaginatedResponse(BaseModel, Generic[T]):
     skip: int
     limit: int
     data: List[T]
+
+
+# task counts for one priority value
+class PriorityCount(BaseModel):
+    priority: Optional[int] = None
+    total: int
+    completed: int
+
+
+# returning per-owner task statistics
+class TaskStats(BaseModel):
+    total: int
+    completed: int
+    pending: int
+    by_priority: List[PriorityCount] = Field(default_factory=list)
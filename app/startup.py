@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+from typing import Callable
+
+from sqlalchemy import inspect, select, delete, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
+
+from . import models
+from .database import Base
+from .stats import rebuild_task_stats
+
+logger = logging.getLogger(__name__)
+
+# number of pooled DB connections to open before reporting ready
+WARM_CONNECTIONS = 2
+REDIS_URL = "redis://localhost"
+REDIS_CONNECT_TIMEOUT = 2  # seconds
+REDIS_RETRY_INITIAL = 1  # seconds, doubled after each failed attempt
+REDIS_RETRY_MAX = 60  # seconds
+
+
+class StartupState:
+    """Tracks boot progress for the health and readiness probes."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.schema = "pending"
+        self.warmup = "pending"
+        self.rate_limiter = "pending"
+        self.timings_ms = {}
+        self.redis = None
+
+    def mark(self, step: str):
+        self.timings_ms[step] = round((time.perf_counter() - self.started_at) * 1000, 1)
+
+    @property
+    def ready(self) -> bool:
+        # the rate limiter is optional, so it does not gate readiness
+        return self.schema == "ok" and self.warmup == "ok"
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "schema": self.schema,
+            "warmup": self.warmup,
+            "rate_limiter": self.rate_limiter,
+            "timings_ms": self.timings_ms,
+        }
+
+
+# per-version upgrade steps: UPGRADES[n] brings a version n-1 database to n.
+# create_all only adds missing tables, so anything else (new columns or
+# indexes on existing tables, data backfills) must be registered here.
+def _add_task_counts(db: Session):
+    # version 1 introduced task_counts; it is only maintained incrementally,
+    # so tasks that already exist are counted once here
+    for index in models.TaskCount.__table__.indexes:
+        db.execute(CreateIndex(index, if_not_exists=True))
+    rebuild_task_stats(db)
+
+
+UPGRADES: dict[int, Callable[[Session], None]] = {
+    1: _add_task_counts,
+}
+
+
+def ensure_schema(bind) -> bool:
+    """
+    Compare the stored schema version with models.SCHEMA_VERSION.
+    When they differ, creates missing tables, runs the UPGRADES steps in
+    order and stamps the new version, so a normal boot costs a single
+    lookup. A database without a version row is treated as version 0.
+    Returns True if it did work.
+    """
+    with bind.connect() as conn:
+        current = None
+        if inspect(conn).has_table(models.SchemaVersion.__tablename__):
+            current = conn.execute(select(models.SchemaVersion.version)).scalar()
+
+    if current == models.SCHEMA_VERSION:
+        return False
+    if current is not None and current > models.SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version {current} is newer than "
+            f"application version {models.SCHEMA_VERSION}"
+        )
+
+    logger.info(f"Upgrading schema from {current} to {models.SCHEMA_VERSION}")
+    Base.metadata.create_all(bind=bind)
+    with Session(bind) as db:
+        for version in range((current or 0) + 1, models.SCHEMA_VERSION + 1):
+            if version in UPGRADES:
+                logger.info(f"Running schema upgrade step {version}")
+                UPGRADES[version](db)
+                db.commit()
+        db.execute(delete(models.SchemaVersion))
+        db.add(models.SchemaVersion(version=models.SCHEMA_VERSION))
+        db.commit()
+    return True
+
+
+def warm_pool(bind, connections: int = WARM_CONNECTIONS):
+    """Open pooled connections up front so first requests skip the connect."""
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = bind.connect()
+            conn.execute(text("SELECT 1"))
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+def warm_auth():
+    """Load the bcrypt backend and jose once, with the cheapest bcrypt cost."""
+    from .security import get_pwd_context
+    from .auth import create_access_token, decode_token
+
+    get_pwd_context().handler().using(rounds=4).hash("warm-up")
+    decode_token(create_access_token({"sub": "0"}))
+
+
+async def warm_up(state: StartupState, bind):
+    try:
+        await asyncio.to_thread(warm_pool, bind)
+        state.mark("pool")
+        await asyncio.to_thread(warm_auth)
+        state.mark("auth")
+        state.warmup = "ok"
+    except Exception as e:
+        logger.warning(f"⚠️ Warm-up failed: {e}")
+        state.warmup = "failed"
+
+
+async def _connect_rate_limiter(url: str):
+    import redis.asyncio as redis
+    from fastapi_limiter import FastAPILimiter
+
+    connection = redis.from_url(url, encoding="utf-8", decode_responses=True)
+    try:
+        await asyncio.wait_for(connection.ping(), REDIS_CONNECT_TIMEOUT)
+        await FastAPILimiter.init(connection)
+    except BaseException:
+        FastAPILimiter.redis = None
+        await connection.aclose()
+        raise
+    return connection
+
+
+async def init_rate_limiter(state: StartupState, url: str = REDIS_URL):
+    """
+    Connect the optional Redis rate limiter without holding up startup.
+    Retries with exponential backoff until Redis is reachable; rate limits
+    fail open (are not enforced) until then.
+    """
+    delay = REDIS_RETRY_INITIAL
+    while True:
+        try:
+            state.redis = await _connect_rate_limiter(url)
+            break
+        except Exception as e:
+            state.rate_limiter = "retrying"
+            logger.warning(
+                f"⚠️ Redis unavailable, rate limits off; retrying in {delay}s: {e}"
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, REDIS_RETRY_MAX)
+    state.rate_limiter = "ok"
+    state.mark("rate_limiter")
+    logger.info("✅ Redis rate limiter initialized successfully.")
+
+
+def _benchmark(runs: int = 5):
+    """Measure import time and time-to-ready in fresh interpreters."""
+    import statistics
+    import subprocess
+    import sys
+    import tempfile
+
+    # each run boots against a throwaway DB so ./tasks.db is never touched
+    probe = """
+import sys, time
+t = time.perf_counter()
+import app.main
+imported = time.perf_counter() - t
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+app.main.engine = create_engine(f"sqlite:///{sys.argv[1]}/bench.db")
+with TestClient(app.main.app):
+    state = app.main.app.state.startup
+    while not state.ready and state.warmup == "pending":
+        time.sleep(0.001)
+    print(imported * 1000, (time.perf_counter() - t) * 1000)
+"""
+    imports, ready = [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = subprocess.run(
+                [sys.executable, "-c", probe, tmp],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+        imports.append(float(out[-2]))
+        ready.append(float(out[-1]))
+    print(f"import app.main: median {statistics.median(imports):.0f} ms")
+    print(f"import to ready: median {statistics.median(ready):.0f} ms")
+
+
+if __name__ == "__main__":
+    # startup benchmark: python -m app.startup
+    _benchmark()
@@ -0,0 +1,136 @@
+import logging
+
+from sqlalchemy import select, delete, update, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models, schemas
+
+logger = logging.getLogger(__name__)
+
+
+def _bucket_filter(owner_id: int, completed: bool, priority: int | None):
+    priority_clause = (
+        models.TaskCount.priority.is_(None)
+        if priority is None
+        else models.TaskCount.priority == priority
+    )
+    return (
+        models.TaskCount.owner_id == owner_id,
+        models.TaskCount.completed == completed,
+        priority_clause,
+    )
+
+
+def apply_task_delta(
+    db: Session, owner_id: int, completed: bool, priority: int | None, delta: int
+):
+    """
+    Adjust the count of one (owner, completed, priority) bucket by delta.
+    Runs inside the caller's transaction, so it commits with the task change.
+    """
+    completed = bool(completed)
+    increment = (
+        update(models.TaskCount)
+        .where(*_bucket_filter(owner_id, completed, priority))
+        .values(count=models.TaskCount.count + delta)
+    )
+    if db.execute(increment).rowcount or delta <= 0:
+        return
+    try:
+        with db.begin_nested():
+            db.add(
+                models.TaskCount(
+                    owner_id=owner_id,
+                    completed=completed,
+                    priority=priority,
+                    count=delta,
+                )
+            )
+    except IntegrityError:
+        # a concurrent request created the bucket first
+        db.execute(increment)
+
+
+def get_task_stats(db: Session, owner_id: int) -> schemas.TaskStats:
+    """Build the stats response for one owner from the aggregate table."""
+    rows = db.execute(
+        select(
+            models.TaskCount.completed,
+            models.TaskCount.priority,
+            models.TaskCount.count,
+        ).where(models.TaskCount.owner_id == owner_id)
+    ).all()
+
+    total = completed = 0
+    by_priority: dict[int | None, schemas.PriorityCount] = {}
+    for is_completed, priority, count in rows:
+        if count < 0:
+            logger.warning(
+                f"Negative task count {count} for owner {owner_id}, "
+                f"completed={is_completed}, priority={priority}; "
+                "run python -m app.stats to rebuild"
+            )
+        elif count == 0:
+            continue
+        total += count
+        bucket = by_priority.setdefault(
+            priority, schemas.PriorityCount(priority=priority, total=0, completed=0)
+        )
+        bucket.total += count
+        if is_completed:
+            completed += count
+            bucket.completed += count
+
+    return schemas.TaskStats(
+        total=total,
+        completed=completed,
+        pending=total - completed,
+        by_priority=sorted(
+            by_priority.values(),
+            key=lambda b: (b.priority is None, b.priority or 0),
+        ),
+    )
+
+
+def rebuild_task_stats(db: Session, owner_id: int | None = None) -> int:
+    """
+    Recompute the aggregate table from the tasks table.
+    Rebuilds a single owner when owner_id is given, otherwise everyone.
+    Returns the number of buckets written.
+    """
+    query = select(
+        models.Task.owner_id,
+        models.Task.completed,
+        models.Task.priority,
+        func.count(),
+    ).group_by(models.Task.owner_id, models.Task.completed, models.Task.priority)
+    clear = delete(models.TaskCount)
+    if owner_id is not None:
+        query = query.where(models.Task.owner_id == owner_id)
+        clear = clear.where(models.TaskCount.owner_id == owner_id)
+
+    db.execute(clear)
+    buckets = [
+        models.TaskCount(
+            owner_id=row_owner,
+            completed=bool(completed),
+            priority=priority,
+            count=count,
+        )
+        for row_owner, completed, priority, count in db.execute(query).all()
+        if row_owner is not None
+    ]
+    db.add_all(buckets)
+    db.commit()
+    return len(buckets)
+
+
+if __name__ == "__main__":
+    # recovery command: python -m app.stats
+    from .database import SessionLocal, engine, Base
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        written = rebuild_task_stats(session)
+    print(f"Rebuilt task stats: {written} buckets")
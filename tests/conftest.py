@@ -4,9 +4,11 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.database import Base, get_db
+from app import main as app_main
 from app.main import app
 from app.auth import create_access_token
 from app import models
+from app.revocation import revocation_store
 
 
 # ✅ Use shared in-memory SQLite for testing
@@ -27,6 +29,9 @@ def override_get_db():
         db.close()
 
 
+# Run the lifespan's schema check and warm-up against the test DB too
+app_main.engine = test_engine
+
 # Disable rate limiter for tests
 app.dependency_overrides = {
     get_db: override_get_db,
@@ -38,6 +43,7 @@ def client():
     # Fresh DB schema before each test
     Base.metadata.drop_all(bind=test_engine)
     Base.metadata.create_all(bind=test_engine)
+    revocation_store.clear()
 
     with TestClient(app) as c:
         yield c
@@ -23,3 +23,47 @@ def test_unauthenticated_user_cannot_access_admin_routes(client):
     """Unauthenticated requests should get a 401 Unauthorized."""
     resp = client.get("/admin/users")
     assert resp.status_code == 401
+
+
+def test_admin_can_rebuild_task_stats(client, admin_auth_header, sample_tasks, db):
+    """Rebuilding should restore stats from the tasks table."""
+    from app import models
+
+    db.query(models.TaskCount).delete()
+    db.commit()
+    assert client.get("/tasks/stats", headers=sample_tasks).json()["total"] == 0
+
+    resp = client.post("/admin/tasks/stats/rebuild", headers=admin_auth_header)
+    assert resp.status_code == 200
+    assert resp.json()["buckets"] == 4
+
+    data = client.get("/tasks/stats", headers=sample_tasks).json()
+    assert data["total"] == 4
+    assert data["completed"] == 2
+
+
+def test_non_admin_cannot_view_compression_metrics(client, auth_header):
+    resp = client.get("/admin/metrics/compression", headers=auth_header)
+    assert resp.status_code == 403
+
+
+def test_admin_compression_metrics(client, admin_auth_header, auth_header):
+    """A compressed response should show up in the metrics snapshot."""
+    from app.compression import compression_stats
+
+    compression_stats.reset()
+    for i in range(20):
+        client.post("/tasks", json={"title": f"task {i}"}, headers=auth_header)
+    resp = client.get(
+        "/tasks?limit=20", headers={**auth_header, "Accept-Encoding": "gzip"}
+    )
+    assert resp.headers["content-encoding"] == "gzip"
+
+    resp = client.get("/admin/metrics/compression", headers=admin_auth_header)
+    assert resp.status_code == 200
+    gzip_stats = resp.json()["gzip"]
+    assert gzip_stats["responses"] == 1
+    assert gzip_stats["bytes_in"] > gzip_stats["bytes_out"]
+    saved = gzip_stats["bytes_in"] - gzip_stats["bytes_out"]
+    assert gzip_stats["bytes_saved"] == saved
+    assert "bytes_saved_per_cpu_ms" in gzip_stats
@@ -0,0 +1,67 @@
+import time
+
+from app import models
+from app.auth import create_refresh_token
+from app.revocation import RevocationStore, BUCKET_SECONDS
+
+
+def test_refresh_rotates_token(client, test_user):
+    """Refreshing should issue a new pair and revoke the old refresh token."""
+    old_token = create_refresh_token(data={"sub": str(test_user.id)})
+    resp = client.post("/refresh", params={"refresh_token": old_token})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["refresh_token"] != old_token
+    assert "access_token" in data
+
+    replay = client.post("/refresh", params={"refresh_token": old_token})
+    assert replay.status_code == 401
+    assert replay.json()["detail"] == "Refresh token revoked"
+
+    resp = client.post("/refresh", params={"refresh_token": data["refresh_token"]})
+    assert resp.status_code == 200
+
+
+def test_logout_revokes_refresh_token(client, test_user):
+    token = create_refresh_token(data={"sub": str(test_user.id)})
+    assert client.post("/logout", params={"refresh_token": token}).status_code == 204
+    resp = client.post("/refresh", params={"refresh_token": token})
+    assert resp.status_code == 401
+
+
+def test_logout_is_idempotent(client, test_user):
+    """Logging out an already revoked token should still return 204."""
+    token = create_refresh_token(data={"sub": str(test_user.id)})
+    assert client.post("/logout", params={"refresh_token": token}).status_code == 204
+    assert client.post("/logout", params={"refresh_token": token}).status_code == 204
+
+
+def test_refresh_rejects_access_token(client, auth_header):
+    token = auth_header["Authorization"].split()[1]
+    resp = client.post("/refresh", params={"refresh_token": token})
+    assert resp.status_code == 401
+
+
+def test_revocations_shared_through_db(client, db):
+    """A second worker's store should pick up revocations from the table."""
+    expires_at = int(time.time()) + 60
+    RevocationStore().revoke(db, "ab" * 16, expires_at)
+
+    other_worker = RevocationStore()
+    assert other_worker.is_revoked(db, "ab" * 16, expires_at)
+    assert not other_worker.is_revoked(db, "cd" * 16, expires_at)
+
+
+def test_expired_entries_are_collected(client, db):
+    """Expired revocations should drop out of memory and the table."""
+    store = RevocationStore()
+    expired = int(time.time()) - 2 * BUCKET_SECONDS
+    live = int(time.time()) + 60
+    store.revoke(db, "ef" * 16, expired)
+    store.revoke(db, "12" * 16, live)
+
+    store.sync(db, force=True)
+    assert not store.is_revoked(db, "ef" * 16, expired)
+    assert store.is_revoked(db, "12" * 16, live)
+    remaining = db.query(models.RevokedToken.jti).all()
+    assert remaining == [("12" * 16,)]
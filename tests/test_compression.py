@@ -0,0 +1,137 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import (
+    CompressionMiddleware,
+    CompressionStats,
+    negotiate_encoding,
+)
+
+
+@pytest.fixture(scope="function")
+def stats():
+    return CompressionStats()
+
+
+@pytest.fixture(scope="function")
+def small_app(stats):
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=100,
+        route_levels={"/raw": 0},
+        stats=stats,
+    )
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse("x" * 1000)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/raw")
+    def raw():
+        return PlainTextResponse("x" * 1000)
+
+    @app.get("/stream")
+    def stream():
+        def chunks():
+            for i in range(5):
+                yield f"chunk-{i}-" * 50
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/export")
+    def export():
+        return StreamingResponse(csv_rows(), media_type="text/csv")
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(
+            (f"data: {i}\n\n" * 50 for i in range(3)), media_type="text/event-stream"
+        )
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"\x00" * 1000, media_type="image/png")
+
+    return TestClient(app)
+
+
+def csv_rows():
+    for i in range(2000):
+        yield f"{i},task {i},{i % 2 == 0},{i % 5}\n"
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_compresses_above_threshold(small_app, stats):
+    resp = small_app.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in resp.headers["vary"].lower()
+    assert resp.text == "x" * 1000
+    assert stats.snapshot()["gzip"]["bytes_saved"] > 0
+
+
+def test_skips_below_threshold(small_app):
+    resp = small_app.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+    assert resp.text == "tiny"
+
+
+def test_route_level_zero_disables(small_app):
+    resp = small_app.get("/raw", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+
+
+def test_streaming_response_is_compressed_incrementally(small_app, stats):
+    expected = "".join(f"chunk-{i}-" * 50 for i in range(5))
+    with small_app.stream(
+        "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+    ) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "content-length" not in resp.headers
+        raw = b"".join(resp.iter_raw())
+    assert gzip.decompress(raw).decode() == expected
+    assert stats.snapshot()["gzip"]["responses"] == 1
+
+
+def test_task_list_is_compressed(client, auth_header):
+    for i in range(20):
+        client.post("/tasks", json={"title": f"task {i}"}, headers=auth_header)
+    resp = client.get(
+        "/tasks?limit=20", headers={**auth_header, "Accept-Encoding": "gzip"}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.json()["total"] == 20
+
+
+def test_streamed_rows_compress_like_one_shot(small_app):
+    """Many small chunks should not be flushed one by one."""
+    expected = "".join(csv_rows()).encode()
+    with small_app.stream(
+        "GET", "/export", headers={"Accept-Encoding": "gzip"}
+    ) as resp:
+        raw = b"".join(resp.iter_raw())
+    assert gzip.decompress(raw) == expected
+    one_shot = gzip.compress(expected, compresslevel=6)
+    assert len(raw) <= len(one_shot) * 1.1
+
+
+def test_excluded_content_types_pass_through(small_app):
+    for path in ("/events", "/image"):
+        resp = small_app.get(path, headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert "content-encoding" not in resp.headers
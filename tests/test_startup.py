@@ -0,0 +1,150 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app import models, startup
+from app.startup import ensure_schema
+from app.stats import apply_task_delta, get_task_stats
+
+
+@pytest.fixture(scope="function")
+def fresh_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_ensure_schema_creates_and_stamps_once(fresh_engine):
+    """First boot creates the tables; later boots only check the version."""
+    assert ensure_schema(fresh_engine) is True
+    with fresh_engine.connect() as conn:
+        version = conn.execute(select(models.SchemaVersion.version)).scalar()
+    assert version == models.SCHEMA_VERSION
+    assert ensure_schema(fresh_engine) is False
+
+
+def test_ensure_schema_rejects_newer_database(fresh_engine):
+    ensure_schema(fresh_engine)
+    with fresh_engine.begin() as conn:
+        conn.execute(
+            models.SchemaVersion.__table__.update().values(
+                version=models.SCHEMA_VERSION + 1
+            )
+        )
+    with pytest.raises(RuntimeError):
+        ensure_schema(fresh_engine)
+
+
+def test_healthz(client):
+    resp = client.get("/healthz")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+
+def test_readyz_after_warm_up(client):
+    """Readiness flips to 200 once the background warm-up has finished."""
+    deadline = time.monotonic() + 5
+    resp = client.get("/readyz")
+    while resp.status_code != 200 and time.monotonic() < deadline:
+        time.sleep(0.01)
+        resp = client.get("/readyz")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["ready"] is True
+    assert data["schema"] == "ok"
+    assert "auth" in data["timings_ms"]
+
+
+def test_ensure_schema_upgrades_unversioned_database(fresh_engine, monkeypatch):
+    """A pre-versioning DB keeps its data, gains new tables and runs every step."""
+    models.Task.__table__.create(fresh_engine)
+    models.User.__table__.create(fresh_engine)
+    with fresh_engine.begin() as conn:
+        conn.execute(
+            models.User.__table__.insert().values(
+                id=1, username="old", email="old@example.com", hashed_password="x"
+            )
+        )
+
+    ran = []
+    steps = range(1, models.SCHEMA_VERSION + 1)
+    monkeypatch.setattr(
+        startup, "UPGRADES", {v: (lambda db, v=v: ran.append(v)) for v in steps}
+    )
+    assert ensure_schema(fresh_engine) is True
+    assert ran == list(steps)
+
+    with fresh_engine.connect() as conn:
+        assert inspect(conn).has_table(models.SchemaVersion.__tablename__)
+        assert conn.execute(select(models.User.username)).scalar() == "old"
+        assert (
+            conn.execute(select(models.SchemaVersion.version)).scalar()
+            == models.SCHEMA_VERSION
+        )
+
+
+def test_rate_limiter_retries_until_connected(monkeypatch):
+    """Redis being down at boot should not leave rate limits off for good."""
+    attempts = []
+
+    async def flaky_connect(url):
+        attempts.append(url)
+        if len(attempts) < 3:
+            raise ConnectionError("redis down")
+        return "connection"
+
+    monkeypatch.setattr(startup, "_connect_rate_limiter", flaky_connect)
+    monkeypatch.setattr(startup, "REDIS_RETRY_INITIAL", 0)
+    state = startup.StartupState()
+    asyncio.run(startup.init_rate_limiter(state))
+
+    assert len(attempts) == 3
+    assert state.rate_limiter == "ok"
+    assert state.redis == "connection"
+
+
+def test_upgrade_backfills_task_counts(fresh_engine):
+    """Tasks that predate task_counts should be counted by the upgrade."""
+    models.User.__table__.create(fresh_engine)
+    models.Task.__table__.create(fresh_engine)
+    with fresh_engine.begin() as conn:
+        conn.execute(
+            models.User.__table__.insert().values(
+                id=1, username="old", email="old@example.com", hashed_password="x"
+            )
+        )
+        conn.execute(
+            models.Task.__table__.insert(),
+            [
+                {"title": "a", "completed": False, "priority": 1, "owner_id": 1},
+                {"title": "b", "completed": True, "priority": 1, "owner_id": 1},
+                {"title": "c", "completed": False, "priority": None, "owner_id": 1},
+            ],
+        )
+
+    ensure_schema(fresh_engine)
+
+    with fresh_engine.connect() as conn:
+        indexes = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index'")
+        ).scalars()
+        assert "ux_task_counts_bucket" in set(indexes)
+
+    with Session(fresh_engine) as db:
+        stats = get_task_stats(db, 1)
+        assert (stats.total, stats.completed) == (3, 1)
+        # an update and a delete of pre-existing tasks must stay consistent
+        apply_task_delta(db, 1, False, 1, -1)
+        apply_task_delta(db, 1, True, 1, 1)
+        apply_task_delta(db, 1, False, None, -1)
+        db.commit()
+        stats = get_task_stats(db, 1)
+        assert (stats.total, stats.completed) == (2, 2)
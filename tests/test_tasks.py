@@ -93,3 +93,99 @@ def test_sorting_invalid_field(client, sample_tasks):
     resp = client.get("/tasks?sort_by=invalid", headers=headers)
     assert resp.status_code == 400
     assert "Invalid sort field" in resp.json()["detail"]
+
+
+def test_task_stats(client, sample_tasks):
+    """Should return counts by completion and priority."""
+    headers = sample_tasks
+    resp = client.get("/tasks/stats", headers=headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 4
+    assert data["completed"] == 2
+    assert data["pending"] == 2
+    assert data["by_priority"] == [
+        {"priority": 1, "total": 2, "completed": 1},
+        {"priority": 2, "total": 1, "completed": 0},
+        {"priority": 3, "total": 1, "completed": 1},
+    ]
+
+
+def test_task_stats_follow_updates_and_deletes(client, auth_header):
+    """Stats should track task updates and deletes incrementally."""
+    post_resp = client.post(
+        "/tasks", json={"title": "tracked", "priority": 1}, headers=auth_header
+    )
+    task_id = post_resp.json()["id"]
+    client.put(
+        f"/tasks/{task_id}",
+        json={"title": "tracked", "completed": True, "priority": 2},
+        headers=auth_header,
+    )
+    data = client.get("/tasks/stats", headers=auth_header).json()
+    assert data["completed"] == 1
+    assert data["by_priority"] == [{"priority": 2, "total": 1, "completed": 1}]
+
+    client.delete(f"/tasks/{task_id}", headers=auth_header)
+    data = client.get("/tasks/stats", headers=auth_header).json()
+    assert data["total"] == 0
+    assert data["by_priority"] == []
+
+
+def test_list_tasks_sparse_fields(client, sample_tasks):
+    """Should return only the requested fields."""
+    headers = sample_tasks
+    resp = client.get("/tasks?fields=id,title&sort_by=title", headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 4
+    assert [set(t) for t in body["data"]] == [{"id", "title"}] * 4
+    assert [t["title"] for t in body["data"]] == ["Task A", "Task B", "Task C", "Task D"]
+
+
+def test_list_tasks_invalid_field(client, sample_tasks):
+    """Should return 400 if an unknown field is requested."""
+    headers = sample_tasks
+    resp = client.get("/tasks?fields=id,hashed_password", headers=headers)
+    assert resp.status_code == 400
+    assert "Invalid field" in resp.json()["detail"]
+
+
+def test_task_count_buckets_are_unique(client, db, test_user):
+    """A bucket can exist only once, including the no-priority bucket."""
+    from sqlalchemy.exc import IntegrityError
+
+    from app import models
+    from app.stats import apply_task_delta
+
+    apply_task_delta(db, test_user.id, False, None, 1)
+    db.commit()
+    db.add(models.TaskCount(owner_id=test_user.id, completed=False, count=1))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
+
+    # later increments land on the single existing row
+    apply_task_delta(db, test_user.id, False, None, 1)
+    db.commit()
+    counts = db.query(models.TaskCount).filter_by(owner_id=test_user.id).all()
+    assert [c.count for c in counts] == [2]
+
+
+def test_sparse_fields_with_filter(client, sample_tasks):
+    """Projection should compose with filters and the total count."""
+    headers = sample_tasks
+    resp = client.get(
+        "/tasks?fields=title&completed=true&sort_by=title", headers=headers
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 2
+    assert body["data"] == [{"title": "Task B"}, {"title": "Task D"}]
+
+
+def test_sparse_fields_documented(client):
+    """The OpenAPI docs should mention that fields= trims the items."""
+    operation = client.get("/openapi.json").json()["paths"]["/tasks"]["get"]
+    assert "fields" in [p["name"] for p in operation["parameters"]]
+    assert "`fields`" in operation["responses"]["200"]["description"]